@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm.session import Session
+
+from .config import settings
+from .exceptions import CampaignForbiddenException, campaign_not_found
+from .sharding import shard_router
+from api.crud import CampaignCrud, ProspectCrud
+
+
+class _Batch:
+    """Enrollments waiting to be written for one (user, campaign) pair"""
+
+    def __init__(self):
+        self.requests: List[Tuple[Set[int], Future]] = []
+        self.size = 0
+        self.full = threading.Event()
+
+
+class CampaignWriteBatcher:
+    """Coalesce concurrent enrollments into the same campaign.
+
+    The first caller for a campaign becomes the leader of a batch: it waits up to
+    window seconds (or until max_ids prospect ids are queued), then performs the
+    campaign lookup, validation, existing-link scan and insert once, in a single
+    transaction, for every caller that joined. Each caller still gets back only
+    the prospect ids that were newly linked on its behalf.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[int], Session],
+        window: float = settings.ENROLL_BATCH_WINDOW_SECONDS,
+        max_ids: int = settings.ENROLL_BATCH_MAX_IDS,
+    ):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_ids = max_ids
+        self._lock = threading.Lock()
+        self._batches: Dict[Tuple[int, int], _Batch] = {}
+
+    def add_prospects(
+        self,
+        user_id: int,
+        campaign_id: int,
+        prospect_ids: Set[int],
+        on_join: Optional[Callable[[], None]] = None,
+    ) -> Set[int]:
+        """Link prospect_ids to a campaign, returning the ids that were newly added.
+
+        on_join is called when the caller joins another caller's batch, i.e. when
+        it will only wait for the leader and use no connection itself.
+        """
+        key = (user_id, campaign_id)
+        future: Future = Future()
+        with self._lock:
+            batch = self._batches.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batches[key] = _Batch()
+            batch.requests.append((set(prospect_ids), future))
+            batch.size += len(prospect_ids)
+            if batch.size >= self.max_ids:
+                batch.full.set()
+
+        if not is_leader and on_join is not None:
+            on_join()
+        if is_leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                # Later callers start a new batch from here on
+                del self._batches[key]
+            self._flush(user_id, campaign_id, batch.requests)
+
+        return future.result()
+
+    def _flush(
+        self,
+        user_id: int,
+        campaign_id: int,
+        requests: List[Tuple[Set[int], Future]],
+    ):
+        db = None
+        try:
+            db = self.session_factory(user_id)
+            campaign = CampaignCrud.get_by_id(db, campaign_id)
+            if not campaign:
+                raise campaign_not_found(campaign_id)
+            if campaign.user_id != user_id:
+                raise CampaignForbiddenException
+
+            requested = set().union(*(ids for ids, _ in requests))
+            valid_ids = ProspectCrud.validate_prospect_ids(db, user_id, requested)
+            # Skips links that exist already, including ones a previous batch for
+            # this campaign is still committing
+            new_ids = CampaignCrud.add_prospects_to_campaign(db, campaign.id, valid_ids)
+
+            # When callers overlap, the id is credited to the first one that asked
+            assigned: Set[int] = set()
+            for ids, future in requests:
+                added = (ids & new_ids) - assigned
+                assigned |= added
+                future.set_result(added)
+        except Exception as exc:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            if db is not None:
+                db.close()
+
+
+enrollment_batcher = CampaignWriteBatcher(shard_router.session_for)
@@ -0,0 +1,160 @@
+import functools
+import inspect
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import settings
+
+
+class LocalCacheBackend:
+    """LRU cache in this process, bounded by the size of the pickled values"""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+    def get_generation(self, key: str) -> int:
+        return self._generations.get(key, 0)
+
+    def bump_generation(self, key: str):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Cache shared by every worker; Redis' maxmemory policy does the eviction"""
+
+    def __init__(self, url: str, ttl: float):
+        # Only needed when a shared store is configured
+        import redis
+
+        # In milliseconds, so TTLs under a second do not round down to 0
+        self.ttl_ms = max(1, int(ttl * 1000))
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._redis.get(f"cache:{key}")
+
+    def set(self, key: str, value: bytes):
+        self._redis.set(f"cache:{key}", value, px=self.ttl_ms)
+
+    def get_generation(self, key: str) -> int:
+        return int(self._redis.get(f"cache-generation:{key}") or 0)
+
+    def bump_generation(self, key: str):
+        self._redis.incr(f"cache-generation:{key}")
+
+    def __len__(self) -> int:
+        # The database also holds generations and rate limit buckets. SCAN walks
+        # it incrementally, which is fine for the stats endpoint
+        return sum(1 for _ in self._redis.scan_iter(match="cache:*", count=1000))
+
+
+class QueryCache:
+    """Cache read query results per user, invalidated by that user's writes.
+
+    Each (namespace, user) pair has a generation number which is part of every
+    cache key. Writes bump the generation, so stale entries are never read
+    again and simply age out of the LRU.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def cached(self, namespace: str, serialize: Callable[[Any], Any] = lambda x: x):
+        """Cache a CRUD read method called as method(db, user_id, ...).
+
+        serialize turns the query result into plain, picklable values (e.g. ORM
+        rows into schemas) so it can outlive the session that loaded it.
+        """
+
+        def decorator(method):
+            signature = inspect.signature(method)
+
+            @functools.wraps(method)
+            def wrapper(cls, db, user_id, *args, **kwargs):
+                bound = signature.bind(cls, db, user_id, *args, **kwargs)
+                bound.apply_defaults()
+                params = list(bound.arguments.items())[3:]
+                generation = self.backend.get_generation(f"{namespace}:{user_id}")
+                key = f"{namespace}:{user_id}:{generation}:{method.__name__}:{params!r}"
+
+                cached = self.backend.get(key)
+                if cached is not None:
+                    with self._lock:
+                        self.hits += 1
+                    return pickle.loads(cached)
+                with self._lock:
+                    self.misses += 1
+                result = serialize(method(cls, db, user_id, *args, **kwargs))
+                self.backend.set(key, pickle.dumps(result))
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, user_id: int, *namespaces: str):
+        """Drop the cached reads of user_id in the given namespaces"""
+        for namespace in namespaces:
+            self.backend.bump_generation(f"{namespace}:{user_id}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self.backend),
+        }
+
+
+query_cache = QueryCache(
+    RedisCacheBackend(settings.REDIS_URL, settings.QUERY_CACHE_TTL_SECONDS)
+    if settings.REDIS_URL
+    else LocalCacheBackend(
+        settings.QUERY_CACHE_MAX_BYTES, settings.QUERY_CACHE_TTL_SECONDS
+    )
+)
@@ -1,3 +1,4 @@
+from typing import Optional
 from dotenv import dotenv_values
 from pydantic import BaseSettings
 
@@ -11,6 +12,26 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str = "Sales Automation"
 
+    # Enrollments for the same campaign arriving within this window are
+    # written in one transaction, unless MAX_IDS is reached first
+    ENROLL_BATCH_WINDOW_SECONDS: float = 0.005
+    ENROLL_BATCH_MAX_IDS: int = 1000
+
+    # Per-user token bucket: sustained requests per second and burst size
+    RATE_LIMIT_PER_SECOND: float = 10
+    RATE_LIMIT_BURST: int = 20
+    # Concurrent requests per worker, defaults to the database pool's size plus
+    # overflow. Requests waiting on another request's enrollment batch are not
+    # counted
+    MAX_IN_FLIGHT: Optional[int] = None
+
+    # Read query results cached per user, in this process unless REDIS_URL is set
+    QUERY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    QUERY_CACHE_TTL_SECONDS: float = 300
+
+    # Optional Redis instance shared by all workers (e.g. rate limit buckets)
+    REDIS_URL: Optional[str] = config.get("REDIS_URL")
+
     class Config:
         case_sensitive = True
 
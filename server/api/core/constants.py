@@ -3,3 +3,5 @@ MIN_PAGE = 0
 DEFAULT_PAGE_SIZE = 10
 MIN_PAGE_SIZE = 1
 MAX_PAGE_SIZE = 100
+UNENROLL_CHUNK_SIZE = 1000
+MAX_BATCH_REQUESTS = 10
@@ -5,3 +5,15 @@ CredentialsException = HTTPException(
     detail="Could not validate credentials",
     headers={"WWW-Authenticate": "Bearer"},
 )
+
+CampaignForbiddenException = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="You do not have access to that campaign",
+)
+
+
+def campaign_not_found(campaign_id) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Campaign with id {campaign_id} does not exist",
+    )
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+from .config import settings
+
+
+class InMemoryBucketStore:
+    """Token buckets kept in this process.
+
+    A bucket that has refilled to burst is the same as a missing one, so those
+    are dropped every burst / rate seconds; only recently seen clients are kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        """Take cost tokens from the bucket for key.
+
+        Returns 0 when the tokens were taken, otherwise the number of seconds
+        until enough tokens will have been refilled.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= burst / rate:
+                self._sweep(now, rate, burst)
+            tokens, last = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (cost - tokens) / rate
+
+    def _sweep(self, now: float, rate: float, burst: int):
+        self._buckets = {
+            key: (tokens, last)
+            for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * rate < burst
+        }
+        self._last_sweep = now
+
+
+class RedisBucketStore:
+    """Token buckets shared by every worker through Redis"""
+
+    # Refill and take atomically, using the Redis clock so workers agree on time
+    TAKE_SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    local wait = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        wait = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        # Only needed when a shared store is configured
+        import redis
+
+        self._take = redis.Redis.from_url(url).register_script(self.TAKE_SCRIPT)
+
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        return float(self._take(keys=[f"ratelimit:{key}"], args=[rate, burst, cost]))
+
+
+class RateLimiter:
+    """Per-client token bucket rate limits"""
+
+    def __init__(self, store, rate: float, burst: int):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+
+    def take(self, key: str, cost: int = 1) -> float:
+        """Returns 0 if the request is admitted, otherwise seconds to wait"""
+        return self.store.take(key, self.rate, self.burst, cost)
+
+
+rate_limiter = RateLimiter(
+    (
+        RedisBucketStore(settings.REDIS_URL)
+        if settings.REDIS_URL
+        else InMemoryBucketStore()
+    ),
+    settings.RATE_LIMIT_PER_SECOND,
+    settings.RATE_LIMIT_BURST,
+)
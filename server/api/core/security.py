@@ -7,7 +7,7 @@ from sqlalchemy.orm.session import Session
 from .config import settings
 from api import schemas
 from api.models import User
-from api.crud.user import UserCrud
+from api.crud import user as user_crud
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -42,7 +42,7 @@ async def authenticate_user(
     """Based on the provided email & password, verify that the credentials match
     the records contained in the database.
     """
-    user = UserCrud.get_user_by_email(db, email)
+    user = user_crud.UserCrud.get_user_by_email(db, email)
     if not user:
         # No user with that email exists in the database
         return False
@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, delete, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.session import Session
+
+from api.database import Base, SessionLocal, engine, shard_urls
+from api.models import (
+    Campaign,
+    CampaignDailyStats,
+    CampaignProspect,
+    CampaignStats,
+    Prospect,
+    TenantShard,
+    User,
+    UserDailyStats,
+    UserStats,
+)
+
+# Each shard allocates ids from its own range so that rows keep their ids when a
+# tenant is moved between shards
+SHARD_ID_RANGE = 2**40
+SEQUENCED_TABLES = [
+    Campaign.__table__,
+    Prospect.__table__,
+    CampaignProspect.__table__,
+]
+# In insert order, rollups last as they reference campaigns
+SHARDED_TABLES = SEQUENCED_TABLES + [
+    CampaignStats.__table__,
+    CampaignDailyStats.__table__,
+    UserStats.__table__,
+    UserDailyStats.__table__,
+]
+MOVE_CHUNK_SIZE = 10000
+
+
+class ShardRouter:
+    """Map users to the database holding their campaigns and prospects.
+
+    The users table and the tenant_shards directory always live on the primary
+    database (shard 0). Users without a directory entry predate sharding and
+    are on the primary as well.
+    """
+
+    def __init__(self, engines: List[Engine]):
+        self.engines = engines
+        self.sessionmakers = [
+            sessionmaker(autocommit=False, autoflush=False, bind=shard_engine)
+            for shard_engine in engines
+        ]
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.engines)
+
+    def get_shard(self, directory_db: Session, user_id: int) -> int:
+        """Get the index of the shard holding user_id's data"""
+        if self.shard_count == 1:
+            return 0
+        shard = (
+            directory_db.query(TenantShard.shard)
+            .filter(TenantShard.user_id == user_id)
+            .scalar()
+        )
+        return shard or 0
+
+    def session_for(
+        self, user_id: int, directory_db: Optional[Session] = None
+    ) -> Session:
+        """Open a session on user_id's shard"""
+        if self.shard_count == 1:
+            return self.sessionmakers[0]()
+        if directory_db is not None:
+            return self.sessionmakers[self.get_shard(directory_db, user_id)]()
+        directory_db = SessionLocal()
+        try:
+            return self.sessionmakers[self.get_shard(directory_db, user_id)]()
+        finally:
+            directory_db.close()
+
+    def assign_shard(self, directory_db: Session, user: User) -> int:
+        """Place a newly registered user on a shard"""
+        shard = user.id % self.shard_count
+        self.mirror_user(user, shard)
+        directory_db.add(TenantShard(user_id=user.id, shard=shard))
+        directory_db.commit()
+        return shard
+
+    def mirror_user(self, user: User, shard: int):
+        """Copy the user row to a shard, so tenant rows there can reference it"""
+        if shard == 0:
+            return
+        db = self.sessionmakers[shard]()
+        try:
+            db.merge(
+                User(
+                    id=user.id,
+                    email=user.email,
+                    password_digest=user.password_digest,
+                    created_at=user.created_at,
+                    updated_at=user.updated_at,
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def prepare_shard(self, shard: int):
+        """Create the tables on a shard and move its id sequences into its range"""
+        shard_engine = self.engines[shard]
+        Base.metadata.create_all(bind=shard_engine)
+        if shard == 0 or shard_engine.dialect.name != "postgresql":
+            # Shard 0 starts its sequences at 1 already
+            return
+        with shard_engine.begin() as conn:
+            for table in SEQUENCED_TABLES:
+                conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"GREATEST(COALESCE(MAX(id), 0), :start)) FROM {table.name}"
+                    ),
+                    {"start": shard * SHARD_ID_RANGE},
+                )
+
+    def move_tenant(
+        self, user_id: int, target: int, chunk_size: int = MOVE_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """Move a user's campaigns, prospects, links and stats to the target shard.
+
+        Rows are copied with their ids in one transaction on the target, then the
+        directory is repointed and the rows are deleted from the source. The
+        tenant should not be writing while this runs. Returns the number of rows
+        moved per table.
+        """
+        directory_db = SessionLocal()
+        try:
+            user = directory_db.query(User).filter(User.id == user_id).one()
+            source = self.get_shard(directory_db, user_id)
+            if source == target:
+                return {}
+
+            self.mirror_user(user, target)
+            tenant_rows = self._tenant_rows(user_id)
+            moved: Dict[str, int] = {}
+            source_engine, target_engine = self.engines[source], self.engines[target]
+            with source_engine.connect() as src, target_engine.begin() as dst:
+                for table in SHARDED_TABLES:
+                    moved[table.name] = 0
+                    rows = src.execution_options(stream_results=True).execute(
+                        select(table).where(tenant_rows[table.name])
+                    )
+                    for chunk in rows.partitions(chunk_size):
+                        dst.execute(
+                            table.insert(), [dict(row._mapping) for row in chunk]
+                        )
+                        moved[table.name] += len(chunk)
+
+            directory_db.merge(TenantShard(user_id=user_id, shard=target))
+            directory_db.commit()
+
+            with source_engine.begin() as src:
+                for table in reversed(SHARDED_TABLES):
+                    src.execute(delete(table).where(tenant_rows[table.name]))
+                if source != 0:
+                    src.execute(delete(User.__table__).where(User.id == user_id))
+            return moved
+        finally:
+            directory_db.close()
+
+    def _tenant_rows(self, user_id: int) -> dict:
+        """Conditions selecting a user's rows in each sharded table"""
+        return {
+            Campaign.__tablename__: Campaign.user_id == user_id,
+            Prospect.__tablename__: Prospect.user_id == user_id,
+            CampaignProspect.__tablename__: CampaignProspect.campaign_id.in_(
+                select(Campaign.id).where(Campaign.user_id == user_id)
+            ),
+            CampaignStats.__tablename__: CampaignStats.user_id == user_id,
+            CampaignDailyStats.__tablename__: CampaignDailyStats.user_id == user_id,
+            UserStats.__tablename__: UserStats.user_id == user_id,
+            UserDailyStats.__tablename__: UserDailyStats.user_id == user_id,
+        }
+
+
+shard_router = ShardRouter([engine] + [create_engine(url) for url in shard_urls])
@@ -1,3 +1,5 @@
 from .user import UserCrud
 from .campaign import CampaignCrud
 from .prospect import ProspectCrud
+from .dedupe import DedupeCrud
+from .stats import StatsCrud
@@ -1,13 +1,35 @@
-from typing import List, Set, Union
+from typing import List, Optional, Set, Union
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.elements import ClauseElement
 from sqlalchemy.sql.functions import func
 from api import schemas
-from api.models import Campaign, CampaignProspect
-from api.core.constants import DEFAULT_PAGE_SIZE, DEFAULT_PAGE, MIN_PAGE, MAX_PAGE_SIZE
+from api.models import Campaign, CampaignProspect, Prospect
+from api.core.cache import query_cache
+from api.crud.stats import StatsCrud
+from api.core.constants import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_PAGE,
+    MIN_PAGE,
+    MAX_PAGE_SIZE,
+    UNENROLL_CHUNK_SIZE,
+)
 
 MAX_SEARCH_RESULTS = 10
 
 
+def escape_like(fragment: str) -> str:
+    """Match fragment literally in a LIKE pattern escaped with a backslash"""
+    for char in ("\\", "%", "_"):
+        fragment = fragment.replace(char, f"\\{char}")
+    return fragment
+
+
+def to_campaign_schemas(campaigns: List[Campaign]) -> List[schemas.Campaign]:
+    return [schemas.Campaign.from_orm(campaign) for campaign in campaigns]
+
+
 class CampaignCrud:
     @classmethod
     def get_users_campaign(
@@ -18,10 +40,18 @@ class CampaignCrud:
         page_size: int = DEFAULT_PAGE_SIZE,
     ) -> Union[List[schemas.Campaign], None]:
         """Get user's campaigns"""
+        # Clamped before the cache, so out of range pages share one entry
         if page < MIN_PAGE:
             page = MIN_PAGE
         if page_size > MAX_PAGE_SIZE:
             page_size = MAX_PAGE_SIZE
+        return cls._get_users_campaign(db, user_id, page, page_size)
+
+    @classmethod
+    @query_cache.cached("campaigns", to_campaign_schemas)
+    def _get_users_campaign(
+        cls, db: Session, user_id: int, page: int, page_size: int
+    ) -> List[schemas.Campaign]:
         res = (
             db.query(Campaign)
             .filter(
@@ -34,13 +64,15 @@ class CampaignCrud:
         return res
 
     @classmethod
+    @query_cache.cached("campaigns")
     def get_user_campaign_total(cls, db: Session, user_id: int) -> int:
         return db.query(Campaign).filter(Campaign.user_id == user_id).count()
 
     @classmethod
+    @query_cache.cached("campaigns", to_campaign_schemas)
     def get_user_campaign_from_name_fragment(
         cls, db: Session, user_id: int, name_fragment: str
-    ) -> Union[List[Campaign], None]:
+    ) -> Union[List[schemas.Campaign], None]:
         return (
             db.query(Campaign)
             .filter(
@@ -57,29 +89,134 @@ class CampaignCrud:
         """Create a user"""
         campaign = Campaign(name=data.name, user_id=user_id)
         db.add(campaign)
+        StatsCrud.record_campaign_created(db, user_id)
         db.commit()
         db.refresh(campaign)
+        query_cache.invalidate(user_id, "campaigns")
         return campaign
 
     @classmethod
-    def get_existing_campaign_prospects(cls, db: Session, campaign_id: int) -> Set[int]:
-        res = (
-            db.query(CampaignProspect.prospect_id)
-            .filter(CampaignProspect.campaign_id == campaign_id)
-            .all()
+    def get_existing_campaign_prospects(
+        cls, db: Session, campaign_id: int, among: Optional[Set[int]] = None
+    ) -> Set[int]:
+        """Get ids of prospects linked to a campaign, optionally only those in among"""
+        query = db.query(CampaignProspect.prospect_id).filter(
+            CampaignProspect.campaign_id == campaign_id
         )
-        return {row.prospect_id for row in res}
+        if among is not None:
+            query = query.filter(CampaignProspect.prospect_id.in_(among))
+        return {row.prospect_id for row in query.all()}
 
     @classmethod
     def add_prospects_to_campaign(
         cls, db: Session, campaign_id: int, prospect_ids: Set[int]
-    ):
-        links = [
-            CampaignProspect(campaign_id=campaign_id, prospect_id=prospect_id)
-            for prospect_id in prospect_ids
-        ]
-        db.add_all(links)
+    ) -> Set[int]:
+        """Link prospects to a campaign, returning the ids that were not linked yet.
+
+        Links already there, even ones committed by a concurrent transaction, are
+        skipped by the unique (campaign_id, prospect_id) index.
+        """
+        if not prospect_ids:
+            return set()
+        links = CampaignProspect.__table__
+        res = db.execute(
+            insert(links)
+            .values(
+                # In a stable order, so concurrent inserts lock rows alike
+                [
+                    {"campaign_id": campaign_id, "prospect_id": prospect_id}
+                    for prospect_id in sorted(prospect_ids)
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["campaign_id", "prospect_id"])
+            .returning(links.c.prospect_id)
+        ).all()
+        added = {row.prospect_id for row in res}
+        user_id = cls._touch(db, campaign_id) if added else None
+        if user_id is not None:
+            StatsCrud.record_enrollments(db, user_id, campaign_id, len(added))
         db.commit()
+        if user_id is not None:
+            query_cache.invalidate(user_id, "campaigns")
+        return added
+
+    @classmethod
+    def remove_prospects_from_campaign(
+        cls,
+        db: Session,
+        campaign_id: int,
+        prospect_ids: Optional[Set[int]] = None,
+        email_fragment: Optional[str] = None,
+        chunk_size: int = UNENROLL_CHUNK_SIZE,
+    ) -> List[int]:
+        """Remove prospects from a campaign, returning the removed prospect ids.
+
+        Links are matched by explicit prospect ids, by an email fragment, or both.
+        Removal runs in chunks of at most chunk_size links, each chunk being one
+        DELETE ... RETURNING committed on its own so row locks are held briefly.
+        """
+        conditions = [CampaignProspect.campaign_id == campaign_id]
+        if email_fragment is not None:
+            conditions.append(
+                CampaignProspect.prospect_id.in_(
+                    select(Prospect.id).where(
+                        Prospect.email.ilike(
+                            f"%{escape_like(email_fragment)}%", escape="\\"
+                        )
+                    )
+                )
+            )
+
+        removed: List[int] = []
+        if prospect_ids is not None:
+            ordered_ids = sorted(prospect_ids)
+            for start in range(0, len(ordered_ids), chunk_size):
+                chunk = ordered_ids[start : start + chunk_size]
+                removed.extend(
+                    cls._delete_links(
+                        db,
+                        campaign_id,
+                        and_(*conditions, CampaignProspect.prospect_id.in_(chunk)),
+                    )
+                )
+            return removed
+
+        while True:
+            link_ids = select(CampaignProspect.id).where(*conditions).limit(chunk_size)
+            deleted = cls._delete_links(
+                db, campaign_id, CampaignProspect.id.in_(link_ids)
+            )
+            removed.extend(deleted)
+            if len(deleted) < chunk_size:
+                return removed
+
+    @classmethod
+    def _delete_links(
+        cls, db: Session, campaign_id: int, condition: ClauseElement
+    ) -> List[int]:
+        """Delete one chunk of links and keep the campaign row in step, in one transaction"""
+        links = CampaignProspect.__table__
+        res = db.execute(
+            delete(links).where(condition).returning(links.c.prospect_id)
+        ).all()
+        user_id = cls._touch(db, campaign_id) if res else None
+        if user_id is not None:
+            StatsCrud.record_enrollments(db, user_id, campaign_id, -len(res))
+        db.commit()
+        if user_id is not None:
+            query_cache.invalidate(user_id, "campaigns")
+        return [row.prospect_id for row in res]
+
+    @classmethod
+    def _touch(cls, db: Session, campaign_id: int) -> Union[int, None]:
+        """Mark a campaign as updated, returning the id of the user owning it"""
+        campaigns = Campaign.__table__
+        return db.execute(
+            update(campaigns)
+            .where(campaigns.c.id == campaign_id)
+            .values(updated_at=func.now())
+            .returning(campaigns.c.user_id)
+        ).scalar()
 
     @classmethod
     def get_by_id(cls, db: Session, campaign_id: int) -> Union[Campaign, None]:
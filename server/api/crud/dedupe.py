@@ -0,0 +1,153 @@
+from typing import Tuple
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    MetaData,
+    String,
+    Table,
+    and_,
+    delete,
+    exists,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.functions import func
+
+from api.core.cache import query_cache
+from api.crud.stats import StatsCrud
+from api.models import CampaignProspect, Prospect
+
+DEDUPE_CHUNK_SIZE = 50000
+
+# Keys of the chunk being de-duplicated, for the duration of its transaction
+chunk_keys = Table(
+    "dedupe_chunk_keys",
+    MetaData(),
+    Column("user_id", BigInteger),
+    Column("email_normalized", String),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+class DedupeCrud:
+    @classmethod
+    def dedupe_next_chunk(
+        cls, db: Session, chunk_size: int = DEDUPE_CHUNK_SIZE
+    ) -> Tuple[int, int]:
+        """Normalize and merge the next chunk of prospects not de-duplicated yet.
+
+        Prospects of the same user sharing a normalized email are merged into the
+        one with the lowest id: their campaign links move over to it and the
+        duplicates are deleted. Duplicate groups are found by grouping on the
+        normalized email over just the keys present in the chunk, never by
+        comparing rows pairwise. The chunk's pending flags are cleared in the
+        same transaction, so an interrupted run resumes where it stopped.
+
+        Returns (prospects scanned, duplicates removed).
+        """
+        prospects, links = Prospect.__table__, CampaignProspect.__table__
+        upper = db.execute(
+            select(func.max(prospects.c.id)).where(
+                prospects.c.id.in_(
+                    select(prospects.c.id)
+                    .where(prospects.c.dedupe_pending)
+                    .order_by(prospects.c.id)
+                    .limit(chunk_size)
+                )
+            )
+        ).scalar()
+        if upper is None:
+            return 0, 0
+
+        # Claim the chunk, normalizing emails with the same rule as
+        # normalize_email, and keep its keys for the statements below. A single
+        # write per row; rows committed later stay pending for the next chunk
+        claimed = (
+            update(prospects)
+            .where(prospects.c.dedupe_pending, prospects.c.id <= upper)
+            .values(
+                email_normalized=func.lower(func.trim(prospects.c.email)),
+                dedupe_pending=False,
+            )
+            .returning(prospects.c.user_id, prospects.c.email_normalized)
+            .cte("claimed")
+        )
+        chunk_keys.create(db.connection())
+        scanned = db.execute(
+            insert(chunk_keys).from_select(
+                ["user_id", "email_normalized"], select(claimed)
+            )
+        ).rowcount
+
+        # Lowest id prospect of every duplicated (user, normalized email) in the chunk
+        survivors = (
+            select(
+                prospects.c.user_id,
+                prospects.c.email_normalized,
+                func.min(prospects.c.id).label("survivor_id"),
+            )
+            .where(
+                tuple_(prospects.c.user_id, prospects.c.email_normalized).in_(
+                    select(chunk_keys.c.user_id, chunk_keys.c.email_normalized)
+                )
+            )
+            .group_by(prospects.c.user_id, prospects.c.email_normalized)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        merges = (
+            select(
+                prospects.c.id.label("duplicate_id"),
+                survivors.c.survivor_id,
+            )
+            .join(
+                survivors,
+                and_(
+                    prospects.c.user_id == survivors.c.user_id,
+                    prospects.c.email_normalized == survivors.c.email_normalized,
+                ),
+            )
+            .where(prospects.c.id != survivors.c.survivor_id)
+            .cte("merges")
+        )
+        duplicate_ids = select(merges.c.duplicate_id)
+
+        # Re-point campaign links to the survivor, unless it is already linked
+        existing = links.alias("existing")
+        db.execute(
+            insert(links)
+            .from_select(
+                ["campaign_id", "prospect_id"],
+                select(links.c.campaign_id, merges.c.survivor_id)
+                .join(merges, links.c.prospect_id == merges.c.duplicate_id)
+                .where(
+                    ~exists().where(
+                        existing.c.campaign_id == links.c.campaign_id,
+                        existing.c.prospect_id == merges.c.survivor_id,
+                    )
+                )
+                .distinct(),
+            )
+            .on_conflict_do_nothing(index_elements=["campaign_id", "prospect_id"])
+        )
+        db.execute(delete(links).where(links.c.prospect_id.in_(duplicate_ids)))
+        removed = db.execute(
+            delete(prospects)
+            .where(prospects.c.id.in_(duplicate_ids))
+            .returning(prospects.c.user_id)
+        ).all()
+
+        # Merged links and deleted prospects change their owners' totals
+        affected = {row.user_id for row in removed}
+        if affected:
+            StatsCrud.refresh(db, affected)
+
+        db.commit()
+        for user_id in affected:
+            query_cache.invalidate(user_id, "prospects")
+        return scanned, len(removed)
@@ -2,9 +2,20 @@ from typing import List, Set, Union
 from sqlalchemy.orm.session import Session
 from api import schemas
 from api.models import Prospect
+from api.core.cache import query_cache
+from api.crud.stats import StatsCrud
 from api.core.constants import DEFAULT_PAGE_SIZE, DEFAULT_PAGE, MIN_PAGE, MAX_PAGE_SIZE
 
 
+def normalize_email(email: str) -> str:
+    """The form of an email used to spot duplicate prospects"""
+    return email.strip().lower()
+
+
+def to_prospect_schemas(prospects: List[Prospect]) -> List[schemas.Prospect]:
+    return [schemas.Prospect.from_orm(prospect) for prospect in prospects]
+
+
 class ProspectCrud:
     @classmethod
     def get_users_prospects(
@@ -13,12 +24,20 @@ class ProspectCrud:
         user_id: int,
         page: int = DEFAULT_PAGE,
         page_size: int = DEFAULT_PAGE_SIZE,
-    ) -> Union[List[Prospect], None]:
+    ) -> Union[List[schemas.Prospect], None]:
         """Get user's prospects"""
+        # Clamped before the cache, so out of range pages share one entry
         if page < MIN_PAGE:
             page = MIN_PAGE
         if page_size > MAX_PAGE_SIZE:
             page_size = MAX_PAGE_SIZE
+        return cls._get_users_prospects(db, user_id, page, page_size)
+
+    @classmethod
+    @query_cache.cached("prospects", to_prospect_schemas)
+    def _get_users_prospects(
+        cls, db: Session, user_id: int, page: int, page_size: int
+    ) -> List[schemas.Prospect]:
         return (
             db.query(Prospect)
             .filter(Prospect.user_id == user_id)
@@ -28,6 +47,7 @@ class ProspectCrud:
         )
 
     @classmethod
+    @query_cache.cached("prospects")
     def get_user_prospects_total(cls, db: Session, user_id: int) -> int:
         return db.query(Prospect).filter(Prospect.user_id == user_id).count()
 
@@ -36,10 +56,16 @@ class ProspectCrud:
         cls, db: Session, user_id: int, data: schemas.ProspectCreate
     ) -> Prospect:
         """Create a prospect"""
-        prospect = Prospect(**data, user_id=user_id)
+        prospect = Prospect(
+            **data.dict(),
+            user_id=user_id,
+            email_normalized=normalize_email(data.email),
+        )
         db.add(prospect)
+        StatsCrud.record_prospects_added(db, user_id, 1)
         db.commit()
         db.refresh(prospect)
+        query_cache.invalidate(user_id, "prospects")
         return prospect
 
     @classmethod
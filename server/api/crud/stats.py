@@ -0,0 +1,300 @@
+from typing import Collection, List, Optional, Union
+
+from sqlalchemy import Table, literal, or_, select, true, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.functions import func
+
+from api.models import (
+    Campaign,
+    CampaignDailyStats,
+    CampaignProspect,
+    CampaignStats,
+    Prospect,
+    UserDailyStats,
+    UserStats,
+)
+
+MAX_STATS_DAYS = 365
+
+
+def since(days: int):
+    """The first day excluded from a window, by the database's clock like the writes"""
+    return func.current_date() - min(days, MAX_STATS_DAYS)
+
+
+def added_counts(table: Table, stmt, counts) -> dict:
+    """ON CONFLICT assignments adding counts; onupdate defaults don't apply there"""
+    assignments = {column: table.c[column] + stmt.excluded[column] for column in counts}
+    if "updated_at" in table.c:
+        assignments["updated_at"] = func.now()
+    return assignments
+
+
+def increment(
+    db: Session, table: Table, keys: dict, counts: dict, owner: Optional[dict] = None
+):
+    """Add counts to a rollup row, creating it with owner columns if needed"""
+    stmt = insert(table).values(**keys, **(owner or {}), **counts)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=list(keys), set_=added_counts(table, stmt, counts)
+        )
+    )
+
+
+def increment_from_select(
+    db: Session, table: Table, keys: List[str], counts: List[str], query
+):
+    """Add the counts selected by query to rollup rows, in one statement"""
+    columns = [column.name for column in query.selected_columns]
+    stmt = insert(table).from_select(columns, query)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=keys, set_=added_counts(table, stmt, counts)
+        )
+    )
+
+
+class StatsCrud:
+    """Rollups behind the dashboards.
+
+    The record_* methods are called by writes, inside their transaction, so the
+    rollups move together with the data. refresh reconciles the totals with the
+    base tables, for the scheduled job and after bulk jobs such as dedupe.
+    """
+
+    @classmethod
+    def record_enrollments(
+        cls, db: Session, user_id: int, campaign_id: int, delta: int
+    ):
+        """Count delta prospects added to (or, when negative, removed from) a campaign"""
+        if not delta:
+            return
+        today = func.current_date()
+        enrolled, removed = max(delta, 0), max(-delta, 0)
+        increment(
+            db,
+            CampaignStats.__table__,
+            {"campaign_id": campaign_id},
+            {"members": delta},
+            owner={"user_id": user_id},
+        )
+        increment(
+            db,
+            CampaignDailyStats.__table__,
+            {"campaign_id": campaign_id, "day": today},
+            {"enrolled": enrolled, "removed": removed},
+            owner={"user_id": user_id},
+        )
+        increment(
+            db,
+            UserStats.__table__,
+            {"user_id": user_id},
+            {"campaigns": 0, "prospects": 0, "members": delta},
+        )
+        increment(
+            db,
+            UserDailyStats.__table__,
+            {"user_id": user_id, "day": today},
+            {"enrolled": enrolled, "removed": removed, "prospects_added": 0},
+        )
+
+    @classmethod
+    def record_campaign_created(cls, db: Session, user_id: int):
+        increment(
+            db,
+            UserStats.__table__,
+            {"user_id": user_id},
+            {"campaigns": 1, "prospects": 0, "members": 0},
+        )
+
+    @classmethod
+    def record_prospects_added(cls, db: Session, user_id: int, count: int):
+        increment(
+            db,
+            UserStats.__table__,
+            {"user_id": user_id},
+            {"campaigns": 0, "prospects": count, "members": 0},
+        )
+        increment(
+            db,
+            UserDailyStats.__table__,
+            {"user_id": user_id, "day": func.current_date()},
+            {"enrolled": 0, "removed": 0, "prospects_added": count},
+        )
+
+    @classmethod
+    def refresh(cls, db: Session, user_ids: Optional[Collection[int]] = None):
+        """Bring campaign and user totals back in line with the base tables.
+
+        Only users in user_ids are refreshed, or everyone when None. Totals are
+        corrected by their drift rather than overwritten, so writes committing
+        meanwhile are not lost. Member drift is also recorded in today's daily
+        rows, as enrollments or removals, so member history stays consistent
+        with the totals. Does not commit.
+        """
+        campaigns, prospects = Campaign.__table__, Prospect.__table__
+        links = CampaignProspect.__table__
+        campaign_stats, user_stats = CampaignStats.__table__, UserStats.__table__
+        today = func.current_date()
+
+        def owned(user_id_column):
+            return true() if user_ids is None else user_id_column.in_(user_ids)
+
+        campaign_members = (
+            select(
+                campaigns.c.id.label("campaign_id"),
+                campaigns.c.user_id,
+                func.count(links.c.id).label("members"),
+            )
+            .select_from(campaigns.outerjoin(links))
+            .where(owned(campaigns.c.user_id))
+            .group_by(campaigns.c.id, campaigns.c.user_id)
+            .subquery()
+        )
+        campaign_drift = (
+            select(
+                campaign_members.c.campaign_id,
+                campaign_members.c.user_id,
+                (
+                    campaign_members.c.members
+                    - func.coalesce(campaign_stats.c.members, 0)
+                ).label("members"),
+            )
+            .select_from(
+                campaign_members.outerjoin(
+                    campaign_stats,
+                    campaign_stats.c.campaign_id == campaign_members.c.campaign_id,
+                )
+            )
+            .where(
+                campaign_members.c.members != func.coalesce(campaign_stats.c.members, 0)
+            )
+            .subquery()
+        )
+        increment_from_select(
+            db,
+            CampaignDailyStats.__table__,
+            ["campaign_id", "day"],
+            ["enrolled", "removed"],
+            select(
+                campaign_drift.c.campaign_id,
+                today.label("day"),
+                campaign_drift.c.user_id,
+                func.greatest(campaign_drift.c.members, 0).label("enrolled"),
+                func.greatest(-campaign_drift.c.members, 0).label("removed"),
+            ),
+        )
+        increment_from_select(
+            db, campaign_stats, ["campaign_id"], ["members"], select(campaign_drift)
+        )
+
+        zero = literal(0)
+        counts = union_all(
+            select(
+                campaigns.c.user_id,
+                func.count().label("campaigns"),
+                zero.label("prospects"),
+                zero.label("members"),
+            )
+            .where(owned(campaigns.c.user_id))
+            .group_by(campaigns.c.user_id),
+            select(prospects.c.user_id, zero, func.count(), zero)
+            .where(owned(prospects.c.user_id))
+            .group_by(prospects.c.user_id),
+            select(campaigns.c.user_id, zero, zero, func.count())
+            .select_from(links.join(campaigns))
+            .where(owned(campaigns.c.user_id))
+            .group_by(campaigns.c.user_id),
+            # Users whose rows are all gone still need their totals zeroed
+            select(user_stats.c.user_id, zero, zero, zero).where(
+                owned(user_stats.c.user_id)
+            ),
+        ).subquery()
+        user_totals = (
+            select(
+                counts.c.user_id,
+                func.sum(counts.c.campaigns).label("campaigns"),
+                func.sum(counts.c.prospects).label("prospects"),
+                func.sum(counts.c.members).label("members"),
+            )
+            .group_by(counts.c.user_id)
+            .subquery()
+        )
+        stored = {
+            column: func.coalesce(user_stats.c[column], 0)
+            for column in ("campaigns", "prospects", "members")
+        }
+        user_drift = (
+            select(
+                user_totals.c.user_id,
+                *(
+                    (user_totals.c[column] - stored[column]).label(column)
+                    for column in stored
+                ),
+            )
+            .select_from(
+                user_totals.outerjoin(
+                    user_stats, user_stats.c.user_id == user_totals.c.user_id
+                )
+            )
+            .where(or_(*(user_totals.c[column] != stored[column] for column in stored)))
+            .subquery()
+        )
+        increment_from_select(
+            db,
+            UserDailyStats.__table__,
+            ["user_id", "day"],
+            ["enrolled", "removed"],
+            select(
+                user_drift.c.user_id,
+                today.label("day"),
+                func.greatest(user_drift.c.members, 0).label("enrolled"),
+                func.greatest(-user_drift.c.members, 0).label("removed"),
+            ).where(user_drift.c.members != 0),
+        )
+        increment_from_select(
+            db, user_stats, ["user_id"], list(stored), select(user_drift)
+        )
+
+    @classmethod
+    def get_campaign_stats(
+        cls, db: Session, campaign_id: int
+    ) -> Union[CampaignStats, None]:
+        return (
+            db.query(CampaignStats)
+            .filter(CampaignStats.campaign_id == campaign_id)
+            .one_or_none()
+        )
+
+    @classmethod
+    def get_campaign_daily_stats(
+        cls, db: Session, campaign_id: int, days: int
+    ) -> List[CampaignDailyStats]:
+        """Rows of the last days days, most recent first"""
+        return (
+            db.query(CampaignDailyStats)
+            .filter(
+                CampaignDailyStats.campaign_id == campaign_id,
+                CampaignDailyStats.day > since(days),
+            )
+            .order_by(CampaignDailyStats.day.desc())
+            .all()
+        )
+
+    @classmethod
+    def get_user_stats(cls, db: Session, user_id: int) -> Union[UserStats, None]:
+        return db.query(UserStats).filter(UserStats.user_id == user_id).one_or_none()
+
+    @classmethod
+    def get_user_daily_stats(
+        cls, db: Session, user_id: int, days: int
+    ) -> List[UserDailyStats]:
+        """Rows of the last days days, most recent first"""
+        return (
+            db.query(UserDailyStats)
+            .filter(UserDailyStats.user_id == user_id, UserDailyStats.day > since(days))
+            .order_by(UserDailyStats.day.desc())
+            .all()
+        )
@@ -1,10 +1,8 @@
 from typing import Union
-from fastapi.param_functions import Depends
 from pydantic.networks import EmailStr
 from sqlalchemy.orm.session import Session
 from api import schemas
 from api.core import security
-from api.dependencies.db import get_db
 from api.models import User
 
 
@@ -7,5 +7,11 @@ from dotenv import dotenv_values
 config = dotenv_values(".env")
 
 engine = create_engine(config.get("DATABASE_URL"))
+# Additional databases holding tenant data, shard 0 being DATABASE_URL itself
+shard_urls = [
+    url.strip()
+    for url in (config.get("SHARD_DATABASE_URLS") or "").split(",")
+    if url.strip()
+]
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
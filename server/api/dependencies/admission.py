@@ -0,0 +1,88 @@
+import math
+import threading
+from typing import Generator, Optional
+
+from fastapi import Depends, HTTPException, status
+from jose import JWTError
+from starlette.requests import Request
+
+from api.core import security
+from api.core.config import settings
+from api.core.ratelimit import rate_limiter
+from api.database import engine
+from api.dependencies.auth import get_token
+
+
+def default_max_in_flight(pool) -> Optional[int]:
+    """As many requests as the pool has connections, overflow included.
+
+    Requests hold one connection at a time, so admitted requests never queue on
+    pool checkout. Requests that joined an enrollment batch hold none and give
+    their slot back, see release_in_flight_slot.
+    """
+    size = getattr(pool, "size", None)
+    if not callable(size):
+        return None
+    return size() + max(getattr(pool, "_max_overflow", 0), 0)
+
+
+max_in_flight = settings.MAX_IN_FLIGHT or default_max_in_flight(engine.pool)
+in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+
+
+def get_client_key(request: Request, token: str) -> str:
+    """Identify the caller by token subject, falling back to their address"""
+    if token:
+        try:
+            return f"user:{security.decode_token(token).sub}"
+        except (JWTError, ValueError):
+            # Rejected later by get_current_user
+            pass
+    return f"host:{request.client.host if request.client else 'unknown'}"
+
+
+def check_rate_limit(client_key: str, cost: int = 1):
+    """Raise a 429 if the client has used up its request budget"""
+    retry_after = rate_limiter.take(client_key, cost)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def admit_request(request: Request, token: str = Depends(get_token)) -> Generator:
+    """Shed load before it reaches the database pool.
+
+    Clients over their rate limit get a 429, and once every in-flight slot is
+    taken new requests get a 503 instead of queueing on pool checkout.
+    """
+    check_rate_limit(get_client_key(request, token))
+
+    if in_flight is None:
+        yield
+        return
+    if not in_flight.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again",
+            headers={"Retry-After": "1"},
+        )
+    request.state.holds_in_flight_slot = True
+    try:
+        yield
+    finally:
+        if request.state.holds_in_flight_slot:
+            in_flight.release()
+
+
+def release_in_flight_slot(request: Request):
+    """Give the request's slot back before it finishes.
+
+    For requests left waiting on work that holds no connection of theirs, such
+    as enrollments that joined another request's batch.
+    """
+    if getattr(request.state, "holds_in_flight_slot", False):
+        request.state.holds_in_flight_slot = False
+        in_flight.release()
@@ -10,7 +10,7 @@ from api import schemas
 from api.core import security
 from api.core.exceptions import CredentialsException
 from api.crud.user import UserCrud
-from api.dependencies.db import get_db
+from api.dependencies.directory import get_directory_db
 
 
 def get_token(request: Request):
@@ -19,7 +19,9 @@ def get_token(request: Request):
     return header_param
 
 
-def get_current_user(token: str = Depends(get_token), db: Session = Depends(get_db)):
+def get_current_user(
+    token: str = Depends(get_token), db: Session = Depends(get_directory_db)
+):
     """Decode the provided jwt and extract the user using the [sub] field."""
     if not token:
         return None
@@ -31,6 +33,9 @@ def get_current_user(token: str = Depends(get_token), db: Session = Depends(get_
             raise CredentialsException
         # Get user from database
         user = UserCrud.get_user_by_email(db, email)
+        # Give the connection back to the pool rather than hold it for the whole
+        # request; user keeps its loaded columns
+        db.close()
         if user is None:
             raise CredentialsException
         return user
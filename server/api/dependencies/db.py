@@ -1,10 +1,25 @@
 from typing import Generator
-from api.database import SessionLocal
+from fastapi import Depends
+from sqlalchemy.orm.session import Session
+from api import schemas
+from api.core.sharding import shard_router
+from api.dependencies.auth import get_current_user
+from api.dependencies.directory import get_directory_db
 
 
-def get_db() -> Generator:
-    """Yield a SQLAlchemy database session"""
-    db = SessionLocal()
+def get_db(
+    current_user: schemas.User = Depends(get_current_user),
+    directory_db: Session = Depends(get_directory_db),
+) -> Generator:
+    """Yield a SQLAlchemy session on the shard holding the current user's data"""
+    shard = shard_router.get_shard(directory_db, current_user.id) if current_user else 0
+    if shard == 0:
+        # The primary database, share the directory session and its connection
+        yield directory_db
+        return
+    # Done with the directory, release its connection before using the shard's
+    directory_db.close()
+    db = shard_router.sessionmakers[shard]()
     try:
         yield db
     finally:
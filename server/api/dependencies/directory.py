@@ -0,0 +1,11 @@
+from typing import Generator
+from api.database import SessionLocal
+
+
+def get_directory_db() -> Generator:
+    """Yield a SQLAlchemy session on the primary database, which holds users"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
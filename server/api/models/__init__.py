@@ -2,3 +2,6 @@ from .user import User
 from .prospects import Prospect
 from .campaigns import Campaign
 from .campaign_prospects import CampaignProspect
+from .tenant_shard import TenantShard
+from .campaign_stats import CampaignStats, CampaignDailyStats
+from .user_stats import UserStats, UserDailyStats
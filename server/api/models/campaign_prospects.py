@@ -1,6 +1,6 @@
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.functions import func
-from sqlalchemy.sql.schema import Column, ForeignKey
+from sqlalchemy.sql.schema import Column, ForeignKey, Index
 from sqlalchemy.sql.sqltypes import BigInteger, DateTime, Integer
 
 from api.database import Base
@@ -10,10 +10,19 @@ class CampaignProspect(Base):
     """Links Prospects to Campaigns"""
 
     __tablename__ = "campaigns_prospects"
+    __table_args__ = (
+        Index(
+            "ix_campaigns_prospects_campaign_id_prospect_id",
+            "campaign_id",
+            "prospect_id",
+            unique=True,
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     campaign_id = Column(BigInteger, ForeignKey("campaigns.id"))
-    prospect_id = Column(BigInteger, ForeignKey("prospects.id"))
+    # Indexed so prospect merges and deletes don't scan every link
+    prospect_id = Column(BigInteger, ForeignKey("prospects.id"), index=True)
 
     prospect = relationship("Prospect", foreign_keys=[prospect_id])
     campaign = relationship("Campaign", foreign_keys=[campaign_id])
@@ -0,0 +1,37 @@
+from sqlalchemy.sql.functions import func
+from sqlalchemy.sql.schema import Column, ForeignKey
+from sqlalchemy.sql.sqltypes import BigInteger, Date, DateTime, Integer
+
+from api.database import Base
+
+
+class CampaignStats(Base):
+    """Current totals of a campaign, kept up to date by enrollment writes"""
+
+    __tablename__ = "campaign_stats"
+
+    campaign_id = Column(BigInteger, ForeignKey("campaigns.id"), primary_key=True)
+    user_id = Column(BigInteger, ForeignKey("users.id"), index=True, nullable=False)
+    members = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"{self.campaign_id} | {self.members} members"
+
+
+class CampaignDailyStats(Base):
+    """Enrollments into and removals from a campaign, per day"""
+
+    __tablename__ = "campaign_daily_stats"
+
+    campaign_id = Column(BigInteger, ForeignKey("campaigns.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    user_id = Column(BigInteger, ForeignKey("users.id"), index=True, nullable=False)
+    enrolled = Column(Integer, nullable=False, default=0)
+    removed = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"{self.campaign_id} | {self.day} | +{self.enrolled} -{self.removed}"
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import text, true
 from sqlalchemy.sql.functions import func
-from sqlalchemy.sql.schema import Column, ForeignKey
-from sqlalchemy.sql.sqltypes import BigInteger, DateTime, Integer, String
+from sqlalchemy.sql.schema import Column, ForeignKey, Index
+from sqlalchemy.sql.sqltypes import BigInteger, Boolean, DateTime, Integer, String
 
 from api.database import Base
 
@@ -10,9 +11,22 @@ class Prospect(Base):
     """Prospects Table"""
 
     __tablename__ = "prospects"
+    __table_args__ = (
+        Index("ix_prospects_user_id_email_normalized", "user_id", "email_normalized"),
+        Index(
+            "ix_prospects_dedupe_pending",
+            "id",
+            postgresql_where=text("dedupe_pending"),
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, unique=True)
     email = Column(String, primary_key=True, nullable=False)
+    # Lowercased, trimmed email used to find duplicates; backfilled by dedupe.py
+    email_normalized = Column(String)
+    # Set on every new row, cleared once dedupe.py has processed it. Unlike an id
+    # watermark this survives late commits and tenants moved between shards
+    dedupe_pending = Column(Boolean, nullable=False, server_default=true())
     first_name = Column(String, index=True, nullable=False)
     last_name = Column(String, index=True, nullable=False)
     user_id = Column(BigInteger, ForeignKey("users.id"), primary_key=True)
@@ -0,0 +1,20 @@
+from sqlalchemy.sql.functions import func
+from sqlalchemy.sql.schema import Column, ForeignKey
+from sqlalchemy.sql.sqltypes import BigInteger, DateTime, Integer
+
+from api.database import Base
+
+
+class TenantShard(Base):
+    """Directory of which shard holds each user's data"""
+
+    __tablename__ = "tenant_shards"
+
+    user_id = Column(BigInteger, ForeignKey("users.id"), primary_key=True)
+    shard = Column(Integer, nullable=False, index=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"{self.user_id} | shard {self.shard}"
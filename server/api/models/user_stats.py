@@ -0,0 +1,38 @@
+from sqlalchemy.sql.functions import func
+from sqlalchemy.sql.schema import Column, ForeignKey
+from sqlalchemy.sql.sqltypes import BigInteger, Date, DateTime, Integer
+
+from api.database import Base
+
+
+class UserStats(Base):
+    """Current totals of a user, kept up to date by writes"""
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(BigInteger, ForeignKey("users.id"), primary_key=True)
+    campaigns = Column(Integer, nullable=False, default=0)
+    prospects = Column(Integer, nullable=False, default=0)
+    members = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"{self.user_id} | {self.campaigns} campaigns"
+
+
+class UserDailyStats(Base):
+    """A user's enrollments, removals and new prospects, per day"""
+
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(BigInteger, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    enrolled = Column(Integer, nullable=False, default=0)
+    removed = Column(Integer, nullable=False, default=0)
+    prospects_added = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"{self.user_id} | {self.day} | +{self.enrolled} -{self.removed}"
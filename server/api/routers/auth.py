@@ -4,13 +4,14 @@ from sqlalchemy.orm.session import Session
 
 from api.core import security
 from api.schemas.auth import LoginRequestBody, LoginResponse
-from api.dependencies.db import get_db
+from api.dependencies.admission import admit_request
+from api.dependencies.directory import get_directory_db
 
-router = APIRouter(prefix="/api", tags=["auth"])
+router = APIRouter(prefix="/api", tags=["auth"], dependencies=[Depends(admit_request)])
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(form_data: LoginRequestBody, db: Session = Depends(get_db)):
+async def login(form_data: LoginRequestBody, db: Session = Depends(get_directory_db)):
     """User will attempt to authenticate with a email/password flow"""
 
     user = await security.authenticate_user(db, form_data.email, form_data.password)
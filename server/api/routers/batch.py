@@ -0,0 +1,112 @@
+import inspect
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from pydantic import ValidationError, parse_obj_as
+from sqlalchemy.orm.session import Session
+from starlette.requests import Request
+from starlette.routing import Match
+
+from api import schemas
+from api.dependencies.admission import admit_request, check_rate_limit, get_client_key
+from api.dependencies.auth import get_current_user, get_token
+from api.dependencies.db import get_db
+from api.routers import campaigns, prospects, stats, users
+
+router = APIRouter(prefix="/api", tags=["batch"], dependencies=[Depends(admit_request)])
+
+# Dependencies a batched endpoint may use, resolved once for the whole batch
+BATCH_DEPENDENCIES = {get_current_user: "current_user", get_db: "db"}
+
+
+def is_batchable(route: APIRoute) -> bool:
+    """Read endpoints whose only dependencies are the user and the session"""
+    if route.methods != {"GET"}:
+        return False
+    for param in inspect.signature(route.endpoint).parameters.values():
+        if isinstance(param.default, DependsParam):
+            if param.default.dependency not in BATCH_DEPENDENCIES:
+                return False
+    return True
+
+
+batchable_routes: List[APIRoute] = [
+    route
+    for api_router in (users.router, campaigns.router, prospects.router, stats.router)
+    for route in api_router.routes
+    if isinstance(route, APIRoute) and is_batchable(route)
+]
+
+
+def match_route(method: str, path: str) -> Tuple[APIRoute, Dict[str, str]]:
+    scope = {"type": "http", "method": method.upper(), "path": path}
+    for route in batchable_routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route, child_scope["path_params"]
+    raise HTTPException(
+        status.HTTP_404_NOT_FOUND, detail=f"{method} {path} cannot be batched"
+    )
+
+
+def run_sub_request(
+    sub_request: schemas.SubRequest, resolved: Dict[str, Any]
+) -> schemas.SubResponse:
+    """Call the matching endpoint directly, reusing the batch's user and session"""
+    url = urlsplit(sub_request.path)
+    try:
+        route, path_params = match_route(sub_request.method, url.path)
+        values = {**dict(parse_qsl(url.query)), **sub_request.params, **path_params}
+
+        kwargs = {}
+        for name, param in inspect.signature(route.endpoint).parameters.items():
+            if isinstance(param.default, DependsParam):
+                kwargs[name] = resolved[BATCH_DEPENDENCIES[param.default.dependency]]
+            elif name in values:
+                kwargs[name] = parse_obj_as(param.annotation, values[name])
+            elif param.default is inspect.Parameter.empty:
+                raise HTTPException(
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Missing parameter {name}",
+                )
+
+        body = parse_obj_as(route.response_model, route.endpoint(**kwargs))
+        return schemas.SubResponse(
+            status=status.HTTP_200_OK, body=jsonable_encoder(body)
+        )
+    except HTTPException as exc:
+        return schemas.SubResponse(status=exc.status_code, body={"error": exc.detail})
+    except ValidationError as exc:
+        return schemas.SubResponse(
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY, body={"error": exc.errors()}
+        )
+
+
+@router.post("/batch", response_model=schemas.BatchResponse)
+def batch(
+    data: schemas.BatchRequest,
+    request: Request,
+    token: str = Depends(get_token),
+    current_user: schemas.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Run several read requests with a single authentication and session"""
+    if not current_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Please log in"
+        )
+    # admit_request charged the batch itself, charge the other requests too
+    if len(data.requests) > 1:
+        check_rate_limit(get_client_key(request, token), len(data.requests) - 1)
+
+    # A session is not thread safe, so sub-requests run one after the other
+    resolved = {"current_user": current_user, "db": db}
+    return {
+        "responses": [
+            run_sub_request(sub_request, resolved) for sub_request in data.requests
+        ]
+    }
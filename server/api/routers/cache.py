@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+
+from api import schemas
+from api.core.cache import query_cache
+from api.dependencies.auth import get_current_user
+from api.dependencies.admission import admit_request
+
+router = APIRouter(prefix="/api", tags=["cache"], dependencies=[Depends(admit_request)])
+
+
+@router.get("/cache/stats", response_model=schemas.CacheStats)
+def get_cache_stats(current_user: schemas.User = Depends(get_current_user)):
+    """Get the query cache hit and miss counts"""
+    if not current_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Please log in"
+        )
+    return query_cache.stats()
@@ -1,15 +1,21 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from sqlalchemy.orm.session import Session
+from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 from api import schemas
 from api.dependencies.auth import get_current_user
+from api.core.batching import enrollment_batcher
 from api.core.constants import DEFAULT_PAGE, DEFAULT_PAGE_SIZE
-from api.crud import CampaignCrud, ProspectCrud
+from api.core.exceptions import CampaignForbiddenException, campaign_not_found
+from api.crud import CampaignCrud
+from api.dependencies.admission import admit_request, release_in_flight_slot
 from api.dependencies.db import get_db
 
-router = APIRouter(prefix="/api", tags=["campaigns"])
+router = APIRouter(
+    prefix="/api", tags=["campaigns"], dependencies=[Depends(admit_request)]
+)
 
 
 @router.get("/campaigns", response_model=schemas.CampaignResponse)
@@ -46,43 +52,73 @@ def search_campaigns(
     return {"campaigns": campaigns}
 
 
+def get_owned_campaign(db: Session, campaign_id: str, current_user: schemas.User):
+    """Fetch a campaign, making sure it exists and belongs to the current user"""
+    if not current_user:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="Please log in")
+
+    campaign = CampaignCrud.get_by_id(db, campaign_id)
+    if not campaign:
+        raise campaign_not_found(campaign_id)
+
+    if campaign.user_id != current_user.id:
+        raise CampaignForbiddenException
+    return campaign
+
+
 @router.post(
     "/campaigns/{campaign_id}/prospects", response_model=schemas.AddToCampaignsResponse
 )
 def add_prospects_to_campaign(
     data: schemas.AddToCampaigns,
-    campaign_id: str,
+    campaign_id: int,
+    request: Request,
     current_user: schemas.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
     """Validate and add prospects to a campaign"""
     if not current_user:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="Please log in")
 
-    campaign = CampaignCrud.get_by_id(db, campaign_id)
-    if not campaign:
+    # Lookup, validation and de-duplication happen in the batched transaction,
+    # shared with concurrent requests for the same campaign. Requests joining a
+    # batch give up their in-flight slot, so the cap does not limit batch size
+    new_prospect_ids = enrollment_batcher.add_prospects(
+        current_user.id,
+        campaign_id,
+        data.prospect_ids,
+        on_join=lambda: release_in_flight_slot(request),
+    )
+
+    return JSONResponse({"prospect_ids": list(new_prospect_ids)}, 200)
+
+
+@router.delete(
+    "/campaigns/{campaign_id}/prospects",
+    response_model=schemas.RemoveFromCampaignsResponse,
+)
+def remove_prospects_from_campaign(
+    data: schemas.RemoveFromCampaigns,
+    campaign_id: str,
+    current_user: schemas.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Bulk remove prospects from a campaign by id and/or email fragment"""
+    get_owned_campaign(db, campaign_id, current_user)
+
+    if data.prospect_ids is None and data.email_fragment is None:
         raise HTTPException(
-            status.HTTP_404_NOT_FOUND,
-            detail=f"Campaign with id {campaign_id} does not exist",
+            status.HTTP_400_BAD_REQUEST,
+            detail="Provide prospect_ids and/or email_fragment",
         )
-
-    if campaign.user_id != current_user.id:
+    if data.email_fragment is not None and not data.email_fragment.strip():
+        # An empty fragment would match, and remove, every prospect. Wildcards
+        # are matched literally by the CRUD layer
         raise HTTPException(
-            status.HTTP_403_FORBIDDEN,
-            detail=f"You do not have access to that campaign",
+            status.HTTP_400_BAD_REQUEST, detail="email_fragment cannot be blank"
         )
 
-    # Get existing prospects for this campaign
-    existing_prospect_ids = CampaignCrud.get_existing_campaign_prospects(
-        db, campaign_id
+    removed_prospect_ids = CampaignCrud.remove_prospects_from_campaign(
+        db, campaign_id, data.prospect_ids, data.email_fragment
     )
 
-    data.prospect_ids = ProspectCrud.validate_prospect_ids(
-        db, current_user.id, data.prospect_ids
-    )
-
-    # Add only valid/non-duplicate prospects
-    new_prospect_ids = data.prospect_ids - existing_prospect_ids
-    CampaignCrud.add_prospects_to_campaign(db, campaign_id, new_prospect_ids)
-
-    return JSONResponse({"prospect_ids": list(new_prospect_ids)}, 200)
+    return {"prospect_ids": removed_prospect_ids}
@@ -4,9 +4,12 @@ from api import schemas
 from api.dependencies.auth import get_current_user
 from api.core.constants import DEFAULT_PAGE, DEFAULT_PAGE_SIZE
 from api.crud import ProspectCrud
+from api.dependencies.admission import admit_request
 from api.dependencies.db import get_db
 
-router = APIRouter(prefix="/api", tags=["prospects"])
+router = APIRouter(
+    prefix="/api", tags=["prospects"], dependencies=[Depends(admit_request)]
+)
 
 
 @router.get("/prospects", response_model=schemas.ProspectResponse)
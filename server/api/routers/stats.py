@@ -0,0 +1,83 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, status, Depends
+from sqlalchemy.orm.session import Session
+
+from api import schemas
+from api.crud import StatsCrud
+from api.dependencies.admission import admit_request
+from api.dependencies.auth import get_current_user
+from api.dependencies.db import get_db
+from api.routers.campaigns import get_owned_campaign
+
+router = APIRouter(prefix="/api", tags=["stats"], dependencies=[Depends(admit_request)])
+
+DEFAULT_STATS_DAYS = 30
+
+
+def with_member_growth(members: int, daily: list) -> List[dict]:
+    """Add the member count at the end of each day, oldest day first.
+
+    Walks back from the current total, undoing each day's net enrollments, so
+    growth comes out of the daily rows without scanning any links.
+    """
+    days = []
+    for row in daily:
+        days.append({**row, "members": members})
+        members -= row["enrolled"] - row["removed"]
+    return days[::-1]
+
+
+@router.get(
+    "/campaigns/{campaign_id}/stats", response_model=schemas.CampaignStatsResponse
+)
+def get_campaign_stats(
+    campaign_id: str,
+    days: int = DEFAULT_STATS_DAYS,
+    current_user: schemas.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get a campaign's members and daily enrollments, from the rollup tables"""
+    campaign = get_owned_campaign(db, campaign_id, current_user)
+
+    totals = StatsCrud.get_campaign_stats(db, campaign.id)
+    daily = [
+        {"day": row.day, "enrolled": row.enrolled, "removed": row.removed}
+        for row in StatsCrud.get_campaign_daily_stats(db, campaign.id, days)
+    ]
+    members = totals.members if totals else 0
+    return {
+        "campaign_id": campaign.id,
+        "members": members,
+        "daily": with_member_growth(members, daily),
+    }
+
+
+@router.get("/stats", response_model=schemas.UserStatsResponse)
+def get_user_stats(
+    days: int = DEFAULT_STATS_DAYS,
+    current_user: schemas.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get the current user's totals and daily activity, from the rollup tables"""
+    if not current_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Please log in"
+        )
+    totals = StatsCrud.get_user_stats(db, current_user.id)
+    daily = [
+        {
+            "day": row.day,
+            "enrolled": row.enrolled,
+            "removed": row.removed,
+            "prospects_added": row.prospects_added,
+        }
+        for row in StatsCrud.get_user_daily_stats(db, current_user.id, days)
+    ]
+    members = totals.members if totals else 0
+    return {
+        "campaigns": totals.campaigns if totals else 0,
+        "prospects": totals.prospects if totals else 0,
+        "members": members,
+        "daily": with_member_growth(members, daily),
+    }
@@ -4,11 +4,13 @@ from sqlalchemy.orm.session import Session
 
 from api import schemas
 from api.core import security
+from api.core.sharding import shard_router
 from api.crud import UserCrud
 from api.dependencies.auth import get_current_user
-from api.dependencies.db import get_db
+from api.dependencies.admission import admit_request
+from api.dependencies.directory import get_directory_db
 
-router = APIRouter(prefix="/api", tags=["user"])
+router = APIRouter(prefix="/api", tags=["user"], dependencies=[Depends(admit_request)])
 
 
 @router.get("/user", response_model=schemas.User)
@@ -24,12 +26,13 @@ def get_authenticated_user(
 
 
 @router.post("/users", response_model=schemas.RegisterResponse)
-def create_user(data: schemas.UserCreate, db: Session = Depends(get_db)):
+def create_user(data: schemas.UserCreate, db: Session = Depends(get_directory_db)):
     """Create a new user record in the database and send a registration confirmation email"""
     db_user = UserCrud.get_user_by_email(db, data.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     new_user = UserCrud.create_user(db, data)
+    shard_router.assign_shard(db, new_user)
 
     token = security.create_access_token(data={"sub": new_user.email})
 
@@ -3,3 +3,6 @@ from .auth import *
 from .token import *
 from .prospects import *
 from .campaigns import *
+from .batch import *
+from .cache import *
+from .stats import *
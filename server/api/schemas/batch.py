@@ -0,0 +1,28 @@
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, conlist
+
+from api.core.constants import MAX_BATCH_REQUESTS
+
+
+class SubRequest(BaseModel):
+    """One API call inside a batch, e.g. GET /api/prospects?page=2"""
+
+    method: str = "GET"
+    path: str
+    params: Dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: conlist(SubRequest, min_items=1, max_items=MAX_BATCH_REQUESTS)
+
+
+class SubResponse(BaseModel):
+    status: int
+    body: Any
+
+
+class BatchResponse(BaseModel):
+    """Responses in the same order as the batched requests"""
+
+    responses: List[SubResponse]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    """Query cache counters of the worker that served the request"""
+
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: int
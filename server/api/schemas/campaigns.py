@@ -41,3 +41,14 @@ class AddToCampaigns(BaseModel):
 
 class AddToCampaignsResponse(BaseModel):
     prospect_ids: List[int]
+
+
+class RemoveFromCampaigns(BaseModel):
+    """Prospects to remove, by id and/or by email fragment"""
+
+    prospect_ids: Optional[Set[int]]
+    email_fragment: Optional[str]
+
+
+class RemoveFromCampaignsResponse(BaseModel):
+    prospect_ids: List[int]
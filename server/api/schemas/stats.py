@@ -0,0 +1,36 @@
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel
+
+
+class CampaignDayStats(BaseModel):
+    """Enrollment activity of a campaign on one day, and its members at the end of it"""
+
+    day: date
+    enrolled: int
+    removed: int
+    members: int
+
+
+class CampaignStatsResponse(BaseModel):
+    campaign_id: int
+    members: int
+    daily: List[CampaignDayStats]
+
+
+class UserDayStats(BaseModel):
+    """Activity of a user on one day, and their campaign members at the end of it"""
+
+    day: date
+    enrolled: int
+    removed: int
+    prospects_added: int
+    members: int
+
+
+class UserStatsResponse(BaseModel):
+    campaigns: int
+    prospects: int
+    members: int
+    daily: List[UserDayStats]
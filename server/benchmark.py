@@ -0,0 +1,97 @@
+"""Benchmark concurrent enrollments into one campaign, with and without batching.
+
+Usage: `python benchmark.py [callers] [ids_per_call]` (run `python seed.py` first)
+"""
+
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api import schemas
+from api.core.batching import enrollment_batcher
+from api.core.sharding import shard_router
+from api.crud import CampaignCrud, ProspectCrud
+from api.database import SessionLocal
+from api.models import Prospect, User
+
+commits = 0
+commits_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "commit")
+def count_commit(_):
+    global commits
+    with commits_lock:
+        commits += 1
+
+
+def enroll_unbatched(user_id: int, campaign_id: int, prospect_ids: Set[int]):
+    """The per-request path the endpoint used before write batching"""
+    db = shard_router.session_for(user_id)
+    try:
+        CampaignCrud.get_by_id(db, campaign_id)
+        existing_ids = CampaignCrud.get_existing_campaign_prospects(db, campaign_id)
+        valid_ids = ProspectCrud.validate_prospect_ids(db, user_id, prospect_ids)
+        CampaignCrud.add_prospects_to_campaign(
+            db, campaign_id, valid_ids - existing_ids
+        )
+    finally:
+        db.close()
+
+
+def enroll_batched(user_id: int, campaign_id: int, prospect_ids: Set[int]):
+    enrollment_batcher.add_prospects(user_id, campaign_id, prospect_ids)
+
+
+def run(
+    name: str,
+    enroll: Callable[[int, int, Set[int]], None],
+    callers: int,
+    ids_per_call: int,
+):
+    global commits
+    directory_db = SessionLocal()
+    user_id = directory_db.query(User.id).order_by(User.id).first().id
+    directory_db.close()
+
+    db = shard_router.session_for(user_id)
+    prospect_ids: List[int] = [
+        row.id for row in db.query(Prospect.id).filter(Prospect.user_id == user_id)
+    ]
+    campaign = CampaignCrud.create_campaign(
+        db, user_id, schemas.CampaignCreate(name=f"Benchmark {name} {time.time()}")
+    )
+    campaign_id = campaign.id
+    db.close()
+
+    def timed_call(_) -> float:
+        start = time.perf_counter()
+        enroll(user_id, campaign_id, set(random.sample(prospect_ids, ids_per_call)))
+        return time.perf_counter() - start
+
+    commits = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        latencies = sorted(executor.map(timed_call, range(callers)))
+    elapsed = time.perf_counter() - start
+
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:>10}: {callers} calls in {elapsed:.3f}s ({callers / elapsed:.0f}/s), "
+        f"{commits} commits "
+        f"({commits / elapsed:.1f}/s), p99 latency {p99 * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    callers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    ids_per_call = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    run("unbatched", enroll_unbatched, callers, ids_per_call)
+    run("batched", enroll_batched, callers, ids_per_call)
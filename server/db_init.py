@@ -3,9 +3,19 @@ from typing import List
 from sqlalchemy import MetaData
 from sqlalchemy.sql.schema import Table
 
-from api.dependencies.db import get_db
-from api.database import Base, engine
-from api.models import User, Prospect, Campaign, CampaignProspect
+from api.core.sharding import shard_router
+from api.database import Base
+from api.models import (
+    User,
+    Prospect,
+    Campaign,
+    CampaignProspect,
+    TenantShard,
+    CampaignStats,
+    CampaignDailyStats,
+    UserStats,
+    UserDailyStats,
+)
 
 
 if __name__ == "__main__":
@@ -14,19 +24,27 @@ if __name__ == "__main__":
 
     if len(args) > 1 and args[1] == "drop":
         ordered_drop: List[Table] = [
+            CampaignDailyStats.__table__,
+            CampaignStats.__table__,
+            UserDailyStats.__table__,
+            UserStats.__table__,
             CampaignProspect.__table__,
             Campaign.__table__,
             Prospect.__table__,
+            TenantShard.__table__,
             User.__table__,
         ]
         print("\n-- Dropping All Tables --")
         for t in ordered_drop:
             print(f"...{t.name}")
-        Base.metadata.drop_all(bind=engine, tables=ordered_drop)
+        for shard_engine in shard_router.engines:
+            Base.metadata.drop_all(bind=shard_engine, tables=ordered_drop)
 
     print("\n-- Creating Tables --")
     metadata: MetaData = Base.metadata
-    metadata.create_all(bind=engine)
+    # Every shard gets the full schema, shard 0 being the primary database
+    for shard in range(shard_router.shard_count):
+        shard_router.prepare_shard(shard)
     # Note: order of table creation depends on import order in api/models/__init__.py
     for t in metadata.tables:
         print(f"...{t}")
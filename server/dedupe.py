@@ -0,0 +1,40 @@
+"""Normalize prospect emails and merge duplicate prospects on every shard.
+
+Only prospects not processed by a previous run are scanned, so this is meant to
+be run on a schedule. Usage: `python dedupe.py [chunk_size]`
+"""
+
+import sys
+import time
+
+from api.core.sharding import shard_router
+from api.crud import DedupeCrud
+from api.crud.dedupe import DEDUPE_CHUNK_SIZE
+
+
+def dedupe_shard(shard: int, chunk_size: int):
+    db = shard_router.sessionmakers[shard]()
+    try:
+        start = time.perf_counter()
+        total_scanned = total_removed = 0
+        while True:
+            scanned, removed = DedupeCrud.dedupe_next_chunk(db, chunk_size)
+            if not scanned:
+                break
+            total_scanned += scanned
+            total_removed += removed
+        elapsed = time.perf_counter() - start
+        print(
+            f"...shard {shard}: scanned {total_scanned} prospects, "
+            f"removed {total_removed} duplicates in {elapsed:.1f}s "
+            f"({total_scanned / elapsed:.0f} rows/s)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    chunk_size = int(sys.argv[1]) if len(sys.argv) > 1 else DEDUPE_CHUNK_SIZE
+    print("\n-- De-duplicating Prospects --")
+    for shard in range(shard_router.shard_count):
+        dedupe_shard(shard, chunk_size)
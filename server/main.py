@@ -5,8 +5,7 @@ from fastapi import FastAPI
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.responses import JSONResponse
 
-from api.routers import auth, users, campaigns, prospects
-
+from api.routers import auth, users, campaigns, prospects, batch, cache, stats
 
 config = dotenv_values(".env")
 
@@ -20,11 +19,18 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(campaigns.router)
 app.include_router(prospects.router)
+app.include_router(batch.router)
+app.include_router(cache.router)
+app.include_router(stats.router)
 
 
 @app.exception_handler(StarletteHTTPException)
 async def custom_http_exception_handler(_, exc):
-    return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+    return JSONResponse(
+        {"error": exc.detail},
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
+    )
 
 
 if __name__ == "__main__":
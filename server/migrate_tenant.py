@@ -0,0 +1,24 @@
+"""Move a tenant's data to another shard.
+
+Usage: `python migrate_tenant.py <user_id> <target_shard>`
+"""
+
+import sys
+
+from api.core.sharding import shard_router
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    user_id, target = int(sys.argv[1]), int(sys.argv[2])
+    if not 0 <= target < shard_router.shard_count:
+        print(f"Shard {target} is not configured ({shard_router.shard_count} shards)")
+        sys.exit(1)
+
+    print(f"\n-- Moving user {user_id} to shard {target} --")
+    moved = shard_router.move_tenant(user_id, target)
+    if not moved:
+        print(f"User {user_id} is already on shard {target}")
+    for table, count in moved.items():
+        print(f"...{table}: {count} rows")
@@ -0,0 +1,29 @@
+"""Recompute the campaign and user stats totals on every shard.
+
+Writes keep the rollups up to date as they go; this reconciles them with the
+base tables, e.g. after rows were changed outside of the API, recording any
+difference as today's enrollments or removals. Meant to be run on a schedule,
+off peak. Usage: `python refresh_stats.py`
+"""
+
+import time
+
+from api.core.sharding import shard_router
+from api.crud import StatsCrud
+
+
+def refresh_shard(shard: int):
+    db = shard_router.sessionmakers[shard]()
+    try:
+        start = time.perf_counter()
+        StatsCrud.refresh(db)
+        db.commit()
+        print(f"...shard {shard} in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("\n-- Refreshing Stats --")
+    for shard in range(shard_router.shard_count):
+        refresh_shard(shard)
@@ -1,6 +1,7 @@
 from sqlalchemy.orm.session import Session
-from api.dependencies.db import get_db
+from api.dependencies.directory import get_directory_db
 from api.core.security import get_password_hash
+from api.crud import StatsCrud
 from api.models import User, Prospect, Campaign, CampaignProspect
 
 
@@ -29,10 +30,13 @@ def seed_data(db: Session):
 
     try:
         db.commit()
+        # Rows were added directly, so compute the rollups from them
+        StatsCrud.refresh(db, [user1.id])
+        db.commit()
     except Exception as e:
         print(e)
 
 
 if __name__ == "__main__":
-    db = next(get_db())
+    db = next(get_directory_db())
     seed_data(db)